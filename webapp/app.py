@@ -17,7 +17,9 @@ from src.services.trace_processor import TraceProcessor
 from src.services.advanced_analytics.advanced_analytics import AdvancedAnalytics
 from src.services.comprehensive_analyzer import ComprehensiveAnalyzer
 from src.services.app_mapper_service import AppMapperService
+from src.services.utils import read_json
 import shutil
+from collections import Counter
 
 def create_app(config_name='default'):
     """Application factory pattern"""
@@ -101,10 +103,9 @@ def load_data():
             return _data_cache['events']
 
         # Load fresh data
-        with open(events_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if not isinstance(data, list):
-                return []
+        data = read_json(events_file)
+        if not isinstance(data, list):
+            return []
 
         # Update cache and clear metadata cache when file changes
         _data_cache['events'] = data
@@ -214,32 +215,32 @@ def get_unique_devices_fast(sample_events, full_events):
     return sorted_devices
 
 
-def create_device_stats(events):
-    """Create device usage statistics"""
-    device_counts = {}
+def create_device_stats(events, top_n=None):
+    """Create device usage statistics, optionally for the top_n most used devices only"""
+    device_counts = Counter()
     device_paths = {}
 
     for event in events:
-        if 'details' in event:
-            # Check both k_dev and k__dev
-            device = event['details'].get('k_dev') or event['details'].get('k__dev')
-            if not device or device == 0:
-                continue
-
-            # Count device usage
-            if device not in device_counts:
-                device_counts[device] = 0
-            device_counts[device] += 1
-
-            # Track pathnames for each device
-            if 'pathname' in event['details'] and event['details']['pathname']:
-                if device not in device_paths:
-                    device_paths[device] = set()
-                device_paths[device].add(event['details']['pathname'])
+        details = event.get('details')
+        if not details:
+            continue
+
+        # Check both k_dev and k__dev (0 means no device)
+        device = details.get('k_dev') or details.get('k__dev')
+        if not device:
+            continue
+
+        # Count device usage
+        device_counts[device] += 1
+
+        # Track pathnames for each device
+        pathname = details.get('pathname')
+        if pathname:
+            device_paths.setdefault(device, set()).add(pathname)
 
     # Convert to list of dictionaries for easy rendering
     device_stats = []
-    for device, count in sorted(device_counts.items(), key=lambda x: x[1], reverse=True):
+    for device, count in device_counts.most_common(top_n):
         paths = list(device_paths.get(device, []))
         device_stats.append({
             'device': device,
@@ -250,41 +251,43 @@ def create_device_stats(events):
 
     return device_stats
 
-def create_event_stats(events):
-    """Create event type statistics"""
-    event_counts = {}
+def create_event_stats(events, top_n=None):
+    """Create event type statistics, optionally for the top_n most frequent event types only"""
+    event_counts = Counter(event.get('event', 'unknown') for event in events)
 
-    for event in events:
-        event_type = event.get('event', 'unknown')
-        if event_type not in event_counts:
-            event_counts[event_type] = 0
-        event_counts[event_type] += 1
-
-    return [{'event': k, 'count': v} for k, v in
-            sorted(event_counts.items(), key=lambda x: x[1], reverse=True)]
+    return [{'event': k, 'count': v} for k, v in event_counts.most_common(top_n)]
 
 def create_pie_chart_base64(data, labels, title):
     """Create a base64 encoded pie chart"""
     if not data or not labels or len(data) != len(labels):
         return None
 
+    fig = None
     try:
-        plt.figure(figsize=(8, 6))
-        plt.pie(data, labels=labels, autopct='%1.1f%%', startangle=90)
-        plt.axis('equal')
-        plt.title(title)
+        # Fold the percentages into the labels instead of a per-wedge autopct callback
+        total = sum(data)
+        pct_labels = [f"{label}\n{100 * value / total:.1f}%" for label, value in zip(labels, data)]
+
+        # Work on an explicit figure so concurrent requests never save or close
+        # whichever figure happens to be pyplot's "current" one
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.pie(data, labels=pct_labels, startangle=90)
+        ax.axis('equal')
+        ax.set_title(title)
 
         buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+        fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight', pil_kwargs={'compress_level': 1})
         buffer.seek(0)
-        plt.close()
 
         img_str = base64.b64encode(buffer.getvalue()).decode('utf-8')
         return img_str
     except Exception as e:
         print(f"Error creating pie chart: {e}")
-        plt.close()
         return None
+    finally:
+        if fig is not None:
+            fig.clear()
+            plt.close(fig)
 
 def process_tcp_events(events):
     """Extract and process TCP state events"""
@@ -353,11 +356,9 @@ def device_pie_chart():
     """API endpoint for device usage pie chart"""
     try:
         events = load_data()
-        device_stats = create_device_stats(events)
-
         # Use configurable number of top devices for chart
         top_n = app.config_class.CHART_TOP_N_DEVICES
-        top_devices = device_stats[:top_n]
+        top_devices = create_device_stats(events, top_n)
         counts = [d['count'] for d in top_devices]
         labels = [f"Device {d['device']}" for d in top_devices]
 
@@ -376,11 +377,9 @@ def event_pie_chart():
     """API endpoint for event type pie chart"""
     try:
         events = load_data()
-        event_stats = create_event_stats(events)
-
         # Use configurable number of top events for chart
         top_n = app.config_class.CHART_TOP_N_EVENTS
-        top_events = event_stats[:top_n]
+        top_events = create_event_stats(events, top_n)
         counts = [e['count'] for e in top_events]
         labels = [e['event'] for e in top_events]
 
@@ -572,6 +571,8 @@ def get_advanced_analytics():
         pid = request.args.get('pid')
         window_size = int(request.args.get('window_size', 1000))
         overlap = int(request.args.get('overlap', 200))
+        # Chart rendering dominates request time; clients that only need the data can pass charts=false
+        include_charts = request.args.get('charts', 'true').lower() != 'false'
 
         # Validate PID parameter
         target_pid = None
@@ -591,7 +592,7 @@ def get_advanced_analytics():
             return jsonify({'error': 'Overlap must be less than window size'}), 400
 
         # Perform advanced analysis with custom parameters
-        analysis = advanced_analytics.analyze_trace_data(events, target_pid, window_size, overlap)
+        analysis = advanced_analytics.analyze_trace_data(events, target_pid, window_size, overlap, include_charts)
 
         return jsonify(analysis)
 
@@ -736,17 +737,15 @@ def get_system_status():
         
         if raw_events_exists:
             try:
-                with open(raw_events_file, 'r', encoding='utf-8') as f:
-                    raw_events = json.load(f)
-                    raw_events_count = len(raw_events) if isinstance(raw_events, list) else 0
+                raw_events = read_json(raw_events_file)
+                raw_events_count = len(raw_events) if isinstance(raw_events, list) else 0
             except:
                 pass
                 
         if sliced_events_exists:
             try:
-                with open(sliced_events_file, 'r', encoding='utf-8') as f:
-                    sliced_events = json.load(f)
-                    sliced_events_count = len(sliced_events) if isinstance(sliced_events, list) else 0
+                sliced_events = read_json(sliced_events_file)
+                sliced_events_count = len(sliced_events) if isinstance(sliced_events, list) else 0
             except:
                 pass
         
@@ -1057,6 +1056,7 @@ def export_analysis():
         format_type = request.args.get('format', 'json')
         window_size = int(request.args.get('window_size', 1000))
         overlap = int(request.args.get('overlap', 200))
+        include_charts = request.args.get('charts', 'true').lower() != 'false'
 
         # Validate PID parameter
         target_pid = None
@@ -1066,7 +1066,7 @@ def export_analysis():
             target_pid = int(pid)
 
         # Perform analysis
-        analysis = advanced_analytics.analyze_trace_data(events, target_pid, window_size, overlap)
+        analysis = advanced_analytics.analyze_trace_data(events, target_pid, window_size, overlap, include_charts)
 
         # Generate filename
         timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
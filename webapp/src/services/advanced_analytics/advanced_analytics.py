@@ -1,4 +1,4 @@
-from collections import Counter
+import numpy as np
 from ..utils import make_json_serializable
 from .network_analyser import NetworkAnalyser
 from .chart_creator import ChartCreator
@@ -24,7 +24,7 @@ class AdvancedAnalytics:
             self.comprehensive_analyzer = None
     
     
-    def analyze_trace_data(self, events, target_pid=None, window_size=1000, overlap=200):
+    def analyze_trace_data(self, events, target_pid=None, window_size=1000, overlap=200, include_charts=True):
         """
         Perform comprehensive analysis of trace data
         
@@ -33,6 +33,8 @@ class AdvancedAnalytics:
             target_pid: Target process ID for analysis
             window_size: Size of analysis windows for behavior timeline
             overlap: Overlap between analysis windows
+            include_charts: Render the matplotlib charts (the most expensive step);
+                            when False 'charts' is None and only the aggregates are returned
             
         Returns:
             dict: Comprehensive analysis results
@@ -46,13 +48,11 @@ class AdvancedAnalytics:
                 target_pid = self._find_target_pid(events)
             
             # Perform different types of analysis
-            time_range = self.descriptives_analyser.analyze_time_range(events)
-            process_analysis = self.descriptives_analyser.analyze_processes(events)
-            device_analysis = self.descriptives_analyser.analyze_devices(events)
-            category_analysis = self.descriptives_analyser.analyze_categories(events)
-            temporal_patterns = self.descriptives_analyser.analyze_temporal_patterns(events, target_pid)
+            descriptives = self.descriptives_analyser.analyze_events(events, target_pid)
             network_analysis = self.network_analyser.analyze_network_events(events)
-            charts = self.chart_creator.generate_charts(events, target_pid,network_analysis['data_transfer'], window_size, overlap)
+            charts = None
+            if include_charts:
+                charts = self.chart_creator.generate_charts(events, target_pid,network_analysis.get('data_transfer', {}), window_size, overlap)
             
             # Add comprehensive analysis for behavior timeline
             comprehensive_analytics = None
@@ -67,12 +67,12 @@ class AdvancedAnalytics:
             analysis = {
                 'target_pid': target_pid,
                 'total_events': len(events),
-                'time_range': time_range,
-                'process_analysis': process_analysis,
-                'device_analysis': device_analysis,
-                'category_analysis': category_analysis,
+                'time_range': descriptives['time_range'],
+                'process_analysis': descriptives['process_analysis'],
+                'device_analysis': descriptives['device_analysis'],
+                'category_analysis': descriptives['category_analysis'],
                 'network_analysis': network_analysis,
-                'temporal_patterns': temporal_patterns,
+                'temporal_patterns': descriptives['temporal_patterns'],
                 'charts': charts,
                 'comprehensive_analytics': comprehensive_analytics,
                 'detailed_insights': self._generate_detailed_insights({
@@ -89,10 +89,14 @@ class AdvancedAnalytics:
     
     def _find_target_pid(self, events):
         """Find the most active PID in the trace"""
-        pid_counts = Counter(e.get('tgid', 0) for e in events if e.get('tgid', 0) > 0)
-        if pid_counts:
-            return pid_counts.most_common(1)[0][0]
-        return 0
+        tgids = np.fromiter((e.get('tgid') or 0 for e in events), dtype=np.int64, count=len(events))
+        tgids = tgids[tgids > 0]
+        if not tgids.size:
+            return 0
+        pids, first_seen, counts = np.unique(tgids, return_index=True, return_counts=True)
+        # Among equally active PIDs keep the one seen first in the trace
+        busiest = np.flatnonzero(counts == counts.max())
+        return int(pids[busiest[first_seen[busiest].argmin()]])
     
     
     def _generate_detailed_insights(self, analysis_data):
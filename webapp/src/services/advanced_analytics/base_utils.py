@@ -1,29 +1,75 @@
 from collections import defaultdict
-from ..utils import get_device_identifier, is_legitimate_sensitive_access
+from functools import lru_cache
+from types import MappingProxyType
+from ..utils import ACCESS_EVENTS, get_device_identifier, is_legitimate_sensitive_access
 
-def check_sensitive_resource(event, sensitive_resources, logger):
-        """Check if event accesses a sensitive resource using device ID matching with pathname validation"""
+# Multiplier for bytes -> MB conversion (power of two, so the product is exact)
+_INV_MB = 1.0 / (1024 * 1024)
+
+# Shared read-only stand-in for events without details (avoids a fresh {} per event)
+_EMPTY_DETAILS = MappingProxyType({})
+
+# Socket type definitions
+_SOCKET_TYPE_MAP = {
+    1: 'SOCK_STREAM',    # TCP
+    2: 'SOCK_DGRAM',     # UDP
+    3: 'SOCK_RAW',       # Raw IP packets
+    4: 'SOCK_RDM',       # Reliable datagram
+    5: 'SOCK_SEQPACKET', # Connection-oriented packets
+    10: 'SOCK_PACKET'    # Device level packet
+}
+
+_SOCKET_TYPE_DESCRIPTIONS = {
+    'SOCK_STREAM': 'TCP',
+    'SOCK_DGRAM': 'UDP',
+    'SOCK_RAW': 'Raw IP',
+    'SOCK_RDM': 'Reliable Datagram',
+    'SOCK_SEQPACKET': 'Sequential Packet',
+    'SOCK_PACKET': 'Device Level',
+    'unknown': 'Unknown Type'
+}
+
+def build_sensitive_index(sensitive_resources):
+        """Invert {data_type: [device ids]} into {device id: (data types, ...)} for constant-time lookups"""
+        index = {}
+        for data_type, device_list in sensitive_resources.items():
+            for dev in device_list:
+                # Lookups use str(device_id), which can only ever equal string entries
+                if isinstance(dev, str):
+                    index.setdefault(dev, []).append(data_type)
+        return {dev: tuple(data_types) for dev, data_types in index.items()}
+
+def check_sensitive_resource(event, sensitive_index, logger):
+        """
+        Check if event accesses a sensitive resource using device ID matching with pathname validation
+
+        sensitive_index is the device id -> data types mapping from build_sensitive_index
+        """
         try:
             # Only check events that are actual file/device access operations
-            if event.get('event', '') not in ['read_probe', 'write_probe', 'ioctl_probe']:
+            if event.get('event', '') not in ACCESS_EVENTS:
+                return None
+            
+            # Nothing to match without device details
+            details = event.get('details')
+            if not details or not sensitive_index:
                 return None
             
             # Get the appropriate device identifier
             device_id = get_device_identifier(event)
             
             if device_id:
-                for data_type, device_list in sensitive_resources.items():
-                    # Check if device ID matches any in the sensitive category
-                    device_id_str = str(device_id)
-                    if device_id_str in device_list:
-                        # Verify this is actually accessing sensitive data, not just any file on same device
-                        pathname = event.get('details', {}).get('pathname', '').lower()
-                        if is_legitimate_sensitive_access(pathname, data_type):
-                            mapped_type = 'call_logs' if data_type == 'call_logs' else data_type
-                            logger.debug(f"Confirmed sensitive access: {mapped_type} via device {device_id_str} path {pathname}")
-                            return mapped_type
-                        else:
-                            logger.debug(f"Device {device_id_str} matches {data_type} but path {pathname} doesn't appear to be sensitive data")
+                # Sensitive categories this device ID belongs to
+                device_id_str = str(device_id)
+                for data_type in sensitive_index.get(device_id_str, ()):
+                    # Verify this is actually accessing sensitive data, not just any file on same device
+                    pathname = details.get('pathname', '')
+                    if is_legitimate_sensitive_access(pathname, data_type):
+                        mapped_type = 'call_logs' if data_type == 'call_logs' else data_type
+                        logger.debug(f"Confirmed sensitive access: {mapped_type} via device {device_id_str} path {pathname}")
+                        return mapped_type
+                    else:
+                        logger.debug(f"Device {device_id_str} matches {data_type} but path {pathname} doesn't appear to be sensitive data")
                             
             return None
             
@@ -33,26 +79,6 @@ def check_sensitive_resource(event, sensitive_resources, logger):
 
 def analyze_socket_types(events):
         """Analyze socket types and their data transfer amounts"""
-        # Socket type definitions
-        socket_type_map = {
-            1: 'SOCK_STREAM',    # TCP
-            2: 'SOCK_DGRAM',     # UDP
-            3: 'SOCK_RAW',       # Raw IP packets
-            4: 'SOCK_RDM',       # Reliable datagram
-            5: 'SOCK_SEQPACKET', # Connection-oriented packets
-            10: 'SOCK_PACKET'    # Device level packet
-        }
-        
-        socket_type_descriptions = {
-            'SOCK_STREAM': 'TCP',
-            'SOCK_DGRAM': 'UDP',
-            'SOCK_RAW': 'Raw IP',
-            'SOCK_RDM': 'Reliable Datagram',
-            'SOCK_SEQPACKET': 'Sequential Packet',
-            'SOCK_PACKET': 'Device Level',
-            'unknown': 'Unknown Type'
-        }
-        
         # Initialize socket type tracking
         socket_types = {
             'total_sockets': 0,
@@ -70,7 +96,7 @@ def analyze_socket_types(events):
         # First pass: identify socket types from socket creation events
         for event in events:
             event_name = event.get('event', '')
-            details = event.get('details', {})
+            details = event.get('details') or _EMPTY_DETAILS
             
             # Socket creation events - check multiple event names that might indicate socket creation
             if (event_name in ['__sys_socket', 'sys_socket', 'socket_create', 'socket_syscall'] and 
@@ -79,12 +105,12 @@ def analyze_socket_types(events):
                 socket_type_num = details.get('type')
                 
                 if socket_fd > 0:  # Valid file descriptor
-                    socket_type = socket_type_map.get(socket_type_num, 'unknown')
+                    socket_type = _SOCKET_TYPE_MAP.get(socket_type_num, 'unknown')
                     fd_to_socket_type[socket_fd] = socket_type
                     
                     # Increment socket type count
                     socket_types['types'][socket_type]['count'] += 1
-                    socket_types['types'][socket_type]['description'] = socket_type_descriptions.get(socket_type, 'Unknown Type')
+                    socket_types['types'][socket_type]['description'] = _SOCKET_TYPE_DESCRIPTIONS.get(socket_type, 'Unknown Type')
                     socket_types['total_sockets'] += 1
             
             # If we can't find socket creation events, infer from other events
@@ -105,7 +131,7 @@ def analyze_socket_types(events):
         # Second pass: associate data transfer with socket types
         for event in events:
             event_name = event.get('event', '')
-            details = event.get('details', {})
+            details = event.get('details') or _EMPTY_DETAILS
             
             # Data transfer events
             if event_name in ['tcp_sendmsg', 'tcp_recvmsg', 'udp_sendmsg', 'udp_recvmsg']:
@@ -141,28 +167,30 @@ def analyze_socket_types(events):
                 socket_types['types'][socket_type]['data_bytes'] += size
         
         # Convert bytes to MB for each socket type
-        bytes_to_mb = lambda b: round(b / (1024 * 1024), 2)
-        for socket_type in socket_types['types']:
-            socket_types['types'][socket_type]['data_mb'] = bytes_to_mb(socket_types['types'][socket_type]['data_bytes'])
+        for type_info in socket_types['types'].values():
+            type_info['data_mb'] = round(type_info['data_bytes'] * _INV_MB, 2)
         
         return socket_types
     
+@lru_cache(maxsize=256)
 def categorize_event(event_type):
-    """Categorize an event type"""
+    """Categorize an event type (cached, traces only use a handful of distinct event names)"""
     if not event_type:
         return 'other'
     
     event_type_lower = event_type.lower()
     
-    if any(keyword in event_type_lower for keyword in ['read', 'pread']):
+    # 'pread'/'pwrite' are covered by the 'read'/'write' substrings
+    if 'read' in event_type_lower:
         return 'read'
-    elif any(keyword in event_type_lower for keyword in ['write', 'pwrite']):
+    elif 'write' in event_type_lower:
         return 'write'
     elif 'ioctl' in event_type_lower:
         return 'ioctl'
     elif 'binder' in event_type_lower:
         return 'binder'
-    elif any(keyword in event_type_lower for keyword in ['unix', 'sock', 'inet', 'tcp', 'udp']):
+    elif ('unix' in event_type_lower or 'sock' in event_type_lower or 'inet' in event_type_lower
+          or 'tcp' in event_type_lower or 'udp' in event_type_lower):
         return 'network'
     else:
         return 'other'
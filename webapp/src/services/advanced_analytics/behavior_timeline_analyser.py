@@ -1,12 +1,64 @@
 import json
-from ..utils import get_device_identifier
+from bisect import bisect_left
+from ..utils import get_device_identifier, read_json
 from . import get_logger
-from .base_utils import check_sensitive_resource
+from .base_utils import build_sensitive_index, check_sensitive_resource
 
 class BehaviourTimelineAnalyser:
+    # Event markers and colors used by the behaviour timeline chart
+    _EVENT_MARKERS = {
+     "camera": "o",          # Circle
+     "TCP_SYN_SENT": "^",    # Triangle Up
+     "audio_in": "x",
+     "bluetooth": "1",
+     "nfc": "2",
+     "gnss": "3",
+     "TCP_LAST_ACK": "v",     # Triangle Down
+     "contacts": "*",
+     "sms": "s",
+     "calendar": "D",
+     "call_logs": "p"
+    }
+    _EVENT_COLORS = {
+        "camera": "blue",
+        "audio_in": "red",
+        "TCP_SYN_SENT": "green",
+        "TCP_LAST_ACK": "orange",
+        "bluetooth": "grey",
+        "nfc": "magenta",
+        "gnss": "black",
+        "contacts": "purple",
+        "sms": "brown",
+        "calendar": "cyan",
+        "call_logs": "olive"
+    }
+    # Event types without "other" category, in y-axis order
+    _EVENT_TYPES = ("camera", "audio_in", "TCP", "bluetooth", "nfc", "gnss", "contacts", "sms", "calendar", "call_logs")
+    # Row of each event type on the y axis
+    _EVENT_TYPE_INDEX = {ev_type: y for y, ev_type in enumerate(_EVENT_TYPES)}
+    # TCP states drawn as a connection teardown
+    _TCP_CLOSE_STATES = frozenset(("TCP_LAST_ACK", "TCP_CLOSE", "TCP_CLOSE_WAIT", "TCP_FIN_WAIT1"))
+    # Sensitive data categories, in the order they are added to a window
+    _SENSITIVE_TYPES = ('contacts', 'sms', 'calendar', 'call_logs')
+
     def __init__(self, config):
         self.config = config
         self.logger = get_logger("BehaviourTimelineAnalyser")
+        # loader name -> ((path, mtime), parsed mapping)
+        self._mapping_cache = {}
+
+    def _load_cached(self, path, loader):
+        # Reuse a parsed mapping file until its modification time changes
+        try:
+            cache_key = (str(path), path.stat().st_mtime)
+        except OSError:
+            return None
+        cached = self._mapping_cache.get(loader.__name__)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+        value = loader(path)
+        self._mapping_cache[loader.__name__] = (cache_key, value)
+        return value
 
     def _load_device_category_mappings(self):
         # Load device category mappings (use OnePlus specific file for more accuracy)
@@ -17,101 +69,65 @@ class BehaviourTimelineAnalyser:
                 # Fallback to generic mapping
                 cat2devs_file = self.config.MAPPINGS_DIR / 'cat2devs.txt'
             
-            if cat2devs_file.exists():
-                with open(cat2devs_file, 'r') as f:
-                    try:
-                        cat2devs = json.load(f)
-                    except json.JSONDecodeError:
-                        cat2devs = {}
-                dev2cat = {}
-                for cat, devs in cat2devs.items():
-                    for dev in devs:
-                        dev2cat[dev] = cat
-            else:
+            dev2cat = self._load_cached(cat2devs_file, self._read_dev2cat)
+            if dev2cat is None:
                 dev2cat = {}
         except:
             dev2cat = {}
         return dev2cat
+
+    @staticmethod
+    def _read_dev2cat(cat2devs_file):
+        try:
+            cat2devs = read_json(cat2devs_file)
+        except json.JSONDecodeError:
+            cat2devs = {}
+        return {dev: cat for cat, devs in cat2devs.items() for dev in devs}
     
-    def _load_device_category_from_txt(self):
-        # Load device categories from cat2devs.txt (unified mapping file)
+    @classmethod
+    def _read_sensitive_resources(cls, cat2devs_file):
+        category_mapping = read_json(cat2devs_file)
+        
+        # Extract sensitive categories for analysis
+        sensitive_resources = {}
+        for category in cls._SENSITIVE_TYPES:
+            if category in category_mapping:
+                sensitive_resources[category] = category_mapping[category]
+        return sensitive_resources
+
+    def _load_sensitive_index(self):
+        # Device ID -> sensitive categories, inverted once per mapping file version
         try:
             cat2devs_file = self.config.MAPPINGS_DIR / 'cat2devs.txt'
-            if cat2devs_file.exists():
-                with open(cat2devs_file, 'r') as f:
-                    category_mapping = json.load(f)
-                
-                # Extract sensitive categories for analysis
-                sensitive_resources = {}
-                sensitive_categories = ['contacts', 'sms', 'calendar', 'call_logs']
-                for category in sensitive_categories:
-                    if category in category_mapping:
-                        sensitive_resources[category] = category_mapping[category]
-            else:
-                sensitive_resources = {}
+            sensitive_index = self._load_cached(cat2devs_file, self._read_sensitive_index)
+            if sensitive_index is None:
+                sensitive_index = {}
         except:
-            sensitive_resources = {}
-        return sensitive_resources
+            sensitive_index = {}
+        return sensitive_index
+
+    @classmethod
+    def _read_sensitive_index(cls, cat2devs_file):
+        return build_sensitive_index(cls._read_sensitive_resources(cat2devs_file))
     
     def _get_cats2windows(self, sensitive_data_trace, cats2windows):
         # Add sensitive data events to windows (matching notebook cell 11 logic)
         for i, ev_list in enumerate(cats2windows):
-            # Add contacts if detected in this window
-            if i < len(sensitive_data_trace['contacts']) and len(sensitive_data_trace['contacts'][i]) > 0:
-                if "contacts" not in ev_list:
-                    ev_list.append("contacts")
-            
-            # Add SMS if detected in this window
-            if i < len(sensitive_data_trace['sms']) and len(sensitive_data_trace['sms'][i]) > 0:
-                if "sms" not in ev_list:
-                    ev_list.append("sms")
-            
-            # Add calendar if detected in this window
-            if i < len(sensitive_data_trace['calendar']) and len(sensitive_data_trace['calendar'][i]) > 0:
-                if "calendar" not in ev_list:
-                    ev_list.append("calendar")
-            
-            # Add call_logs if detected in this window
-            if i < len(sensitive_data_trace['call_logs']) and len(sensitive_data_trace['call_logs'][i]) > 0:
-                if "call_logs" not in ev_list:
-                    ev_list.append("call_logs")
+            # Add each sensitive data type detected in this window
+            for data_type in self._SENSITIVE_TYPES:
+                touched = sensitive_data_trace[data_type]
+                if i < len(touched) and touched[i] and data_type not in ev_list:
+                    ev_list.append(data_type)
         return cats2windows
     
     def analyse_for_behavior_timeline_chart(self, events, target_pid, window_size=1000, overlap=200):
         """Create high-level behavior timeline chart based on notebook cell 11"""
-        # Define event markers and colors at the beginning
-        event_markers = {
-         "camera": "o",          # Circle
-         "TCP_SYN_SENT": "^",    # Triangle Up
-         "audio_in": "x",
-         "bluetooth": "1",
-         "nfc": "2",
-         "gnss": "3",
-         "TCP_LAST_ACK": "v",     # Triangle Down
-         "contacts": "*",
-         "sms": "s",
-         "calendar": "D",
-         "call_logs": "p"
-        }
-        event_colors = {
-            "camera": "blue",
-            "audio_in": "red",
-            "TCP_SYN_SENT": "green",
-            "TCP_LAST_ACK": "orange",
-            "bluetooth": "grey",
-            "nfc": "magenta",
-            "gnss": "black",
-            "contacts": "purple",
-            "sms": "brown",
-            "calendar": "cyan",
-            "call_logs": "olive"
-        }
-        
         try:
             dev2cat = self._load_device_category_mappings()
-            sensitive_resources = self._load_device_category_from_txt()
-            # Define event types without "other" category
-            event_types = ["camera", "audio_in", "TCP", "bluetooth", "nfc", "gnss", "contacts", "sms", "calendar", "call_logs"]
+            sensitive_index = self._load_sensitive_index()
+            event_markers = self._EVENT_MARKERS
+            event_colors = self._EVENT_COLORS
+            y_index = self._EVENT_TYPE_INDEX
             
             # Use provided window parameters
             step = window_size - overlap
@@ -122,54 +138,65 @@ class BehaviourTimelineAnalyser:
             # Get windows and categorize devices/events in each window
             cats2windows = []
             tcp_events_windows = []
-            sensitive_data_trace = {'contacts': [], 'sms': [], 'calendar': [], 'call_logs': []}
+            sensitive_data_trace = {data_type: [] for data_type in self._SENSITIVE_TYPES}
+            
+            # Per-event observations, computed once rather than once per overlapping window.
+            # Each *_idx list holds ascending event indices, so a window's share is a bisect slice.
+            cat_idx, cat_vals = [], []
+            tcp_idx, tcp_vals = [], []
+            sensitive_idx, sensitive_vals = [], []
+            for idx, event in enumerate(events):
+                if 'details' not in event:
+                    continue
+                
+                # Device categorization for the target process
+                if event.get('tgid') == target_pid:
+                    # Get device identifier - use stdev+inode for regular files, kdev for device nodes
+                    device_id = get_device_identifier(event)
+                    if device_id and device_id in dev2cat:
+                        cat = dev2cat[device_id]
+                        # Only add categories that are in our defined event types
+                        if cat in y_index:
+                            cat_idx.append(idx)
+                            cat_vals.append(cat)
+                
+                # TCP events
+                if event.get('event') == 'inet_sock_set_state':
+                    details = event['details']
+                    if 'newstate' in details and 'daddr' in details:
+                        # Include both IP and port information
+                        daddr = details.get('daddr', 'unknown')
+                        dport = details.get('dport', '')
+                        sport = details.get('sport', '')
+                        
+                        # Format: STATE: IP:PORT (local_port)
+                        if dport and sport:
+                            tcp_info = f"{details['newstate']}: {daddr}:{dport} ({sport})"
+                        else:
+                            tcp_info = f"{details['newstate']}: {daddr}"
+                        tcp_idx.append(idx)
+                        tcp_vals.append(tcp_info)
+                
+                # Sensitive data detection (device+inode matching)
+                if sensitive_index:
+                    sensitive_type = check_sensitive_resource(event, sensitive_index, self.logger)
+                    if sensitive_type and sensitive_type in sensitive_data_trace:
+                        sensitive_idx.append(idx)
+                        sensitive_vals.append(sensitive_type)
             
             i = 0
             while i < len(events):
                 end = min(i + window_size, len(events))
-                window = events[i:end]
                 
-                # Categorize events in this window
-                cats_window = []
-                tcp_window = []
-                window_sensitive = {data_type: [] for data_type in sensitive_data_trace}
+                # Categorize events in this window (dict keys act as an insertion-ordered set)
+                cats_window = list(dict.fromkeys(cat_vals[bisect_left(cat_idx, i):bisect_left(cat_idx, end)]))
                 
-                # Device categorization and sensitive data detection
-                for event in window:
-                    if event.get('tgid') == target_pid and 'details' in event:
-                        # Get device identifier - use stdev+inode for regular files, kdev for device nodes
-                        device_id = get_device_identifier(event)
-                        if device_id and device_id in dev2cat:
-                            cat = dev2cat[device_id]
-                            # Only add categories that are in our defined event types
-                            if cat in event_types and cat not in cats_window:
-                                cats_window.append(cat)
-                    
-                    # TCP events
-                    if event.get('event') == 'inet_sock_set_state' and 'details' in event:
-                        details = event['details']
-                        if 'newstate' in details and 'daddr' in details:
-                            # Include both IP and port information
-                            daddr = details.get('daddr', 'unknown')
-                            dport = details.get('dport', '')
-                            sport = details.get('sport', '')
-                            
-                            # Format: STATE: IP:PORT (local_port)
-                            if dport and sport:
-                                tcp_info = f"{details['newstate']}: {daddr}:{dport} ({sport})"
-                            else:
-                                tcp_info = f"{details['newstate']}: {daddr}"
-                            tcp_window.append(tcp_info)
-                    
-                    # Sensitive data detection (device+inode matching)
-                    if sensitive_resources and 'details' in event:
-                        sensitive_type = check_sensitive_resource(event, sensitive_resources, self.logger)
-                        if sensitive_type and sensitive_type in window_sensitive:
-                            window_sensitive[sensitive_type].append(event)
+                tcp_window = tcp_vals[bisect_left(tcp_idx, i):bisect_left(tcp_idx, end)]
                 
-                # Store sensitive data for this window
-                for data_type in sensitive_data_trace:
-                    sensitive_data_trace[data_type].append(window_sensitive[data_type])
+                # Record which sensitive data types were touched in this window
+                window_sensitive = set(sensitive_vals[bisect_left(sensitive_idx, i):bisect_left(sensitive_idx, end)])
+                for data_type, touched in sensitive_data_trace.items():
+                    touched.append(data_type in window_sensitive)
                 
                 cats2windows.append(cats_window)
                 tcp_events_windows.append(tcp_window)
@@ -189,38 +216,29 @@ class BehaviourTimelineAnalyser:
             x_values, y_values, markers, colors, annotations = [], [], [], [], []
             
             N = len(cats2windows)
+            tcp_y = y_index["TCP"]
             
             for i, ev_list in enumerate(cats2windows):
                 for ev in ev_list:
-                    # Skip if the event is not in our defined event types or not a TCP event
-                    if not (ev in event_types or ev.startswith("TCP_")):
-                        continue
-                        
-                    if ev.startswith("TCP_SYN_SENT"):
-                        ev_type = "TCP"
+                    # TCP entries read "STATE: address"; category entries have no separator
+                    state, _, ip = ev.partition(": ")
+                    if state == "TCP_SYN_SENT":
                         marker = event_markers["TCP_SYN_SENT"]
                         color = event_colors["TCP_SYN_SENT"]
-                        ip = ev.split(": ")[1] if ": " in ev else ""
-                        annotations.append((i, event_types.index("TCP"), ip, marker, color))
-                    elif ev.startswith("TCP_LAST_ACK") or ev.startswith("TCP_CLOSE") or ev.startswith("TCP_FIN_WAIT1"):
-                        ev_type = "TCP"
+                        annotations.append((i, tcp_y, ip, marker, color))
+                        y_pos = tcp_y
+                    elif state in self._TCP_CLOSE_STATES:
                         marker = event_markers["TCP_LAST_ACK"]
                         color = event_colors["TCP_LAST_ACK"]
-                        ip = ev.split(": ")[1] if ": " in ev else ""
-                        annotations.append((i, event_types.index("TCP"), ip, marker, color))
-                    elif ev in event_types:
-                        ev_type = ev
+                        annotations.append((i, tcp_y, ip, marker, color))
+                        y_pos = tcp_y
+                    elif ev in y_index:
                         marker = event_markers.get(ev, "o")
                         color = event_colors.get(ev, "blue")
+                        y_pos = y_index[ev]
                     else:
                         continue  # Skip unknown events
                     
-                    # Determine y-position for the event
-                    if "TCP" in ev:
-                        y_pos = event_types.index("TCP")
-                    else:
-                        y_pos = event_types.index(ev_type)
-                    
                     x_values.append(i)
                     y_values.append(y_pos)
                     markers.append(marker)
@@ -228,7 +246,7 @@ class BehaviourTimelineAnalyser:
             
             if not x_values:
                 return None
-            return (x_values, y_values, markers, colors, annotations, event_types, target_pid, event_markers, N)
+            return (x_values, y_values, markers, colors, annotations, list(self._EVENT_TYPES), target_pid, event_markers, N)
 
         except Exception as e:
             self.logger.error(f"Error analysing behavior timeline : {str(e)}")
@@ -1,96 +1,234 @@
 from collections import Counter, defaultdict
+import heapq
 import json
 import numpy as np
-from ..utils import get_device_identifier
+from ..utils import get_device_identifier, read_json
 from . import get_logger
 from .base_utils import categorize_event
 
+# Representative pathnames kept per device (the dashboard only lists a few)
+_MAX_DEVICE_PATHS = 32
+
 class DescriptivesAnalyser:
     def __init__(self, config_class):
         self.logger = get_logger("DescriptivesAnalyser")
         self.config = config_class
+        # (path, mtime) -> flattened device category mapping
+        self._dev2cat_cache = None
     
-    def analyze_time_range(self, events):
-        """Analyze the time range of events"""
-        timestamps = [e.get('timestamp', 0) for e in events if e.get('timestamp')]
-        if not timestamps:
-            return {'error': 'No timestamps found'}
-        
+    def analyze_events(self, events, target_pid):
+        """
+        Run every descriptive analysis over a single pass of the events
+
+        Args:
+            events: List of parsed events
+            target_pid: Target process ID for the temporal analysis
+
+        Returns:
+            dict: time_range, process_analysis, device_analysis,
+                  category_analysis and temporal_patterns results
+        """
+        scan = self._scan_events(events, target_pid)
         return {
-            'start_time': min(timestamps),
-            'end_time': max(timestamps),
-            'duration': max(timestamps) - min(timestamps),
-            'total_events': len(timestamps)
+            'time_range': self._summarize_time_range(scan),
+            'process_analysis': self._summarize_processes(scan),
+            'device_analysis': self._summarize_devices(scan),
+            'category_analysis': self._summarize_categories(scan),
+            'temporal_patterns': self._summarize_temporal_patterns(scan, target_pid)
         }
+
+    def analyze_time_range(self, events):
+        """Analyze the time range of events"""
+        return self._summarize_time_range(self._scan_events(events))
     
     def analyze_processes(self, events):
         """Analyze process distribution"""
-        process_counts = Counter(e.get('process', 'unknown') for e in events)
-        pid_counts = Counter(e.get('tgid', 0) for e in events if e.get('tgid', 0) > 0)
-        
-        # Map PIDs to process names
-        pid_to_process = {}
-        for e in events:
-            if e.get('tgid') and e.get('process'):
-                pid_to_process[e['tgid']] = e['process']
-        
-        return {
-            'process_distribution': dict(process_counts.most_common(10)),
-            'pid_distribution': {str(k): v for k, v in pid_counts.most_common(10)},
-            'pid_to_process_map': {str(k): v for k, v in pid_to_process.items()},
-            'unique_processes': len(process_counts),
-            'unique_pids': len(pid_counts)
-        }
-    
+        return self._summarize_processes(self._scan_events(events))
 
     def analyze_devices(self, events):
         """Analyze device usage patterns"""
-        device_counts = defaultdict(int)
-        device_paths = defaultdict(set)
-        device_categories = defaultdict(int)
-        
-        # Load device category mappings
+        return self._summarize_devices(self._scan_events(events))
+
+    def analyze_categories(self, events):
+        """Analyze event categories"""
+        return self._summarize_categories(self._scan_events(events))
+
+    def analyze_temporal_patterns(self, events, target_pid):
+        """Analyze temporal patterns in the data"""
+        return self._summarize_temporal_patterns(self._scan_events(events, target_pid), target_pid)
+
+    def _load_dev2cat(self):
+        """Load device -> category mapping from cat2devs.txt, reusing it while the file is unchanged"""
         try:
             cat2devs_file = self.config.MAPPINGS_DIR / 'cat2devs.txt'
-            if cat2devs_file.exists():
-                with open(cat2devs_file, 'r') as f:
-                    try:
-                        cat2devs = json.load(f)
-                    except json.JSONDecodeError:
-                        cat2devs = {}
-                dev2cat = {}
-                for cat, devs in cat2devs.items():
-                    for dev in devs:
-                        # Store both int and str versions for flexible lookup
-                        dev2cat[dev] = cat
-                        dev2cat[str(dev)] = cat
-            else:
-                dev2cat = {}
+            try:
+                cache_key = (str(cat2devs_file), cat2devs_file.stat().st_mtime)
+            except OSError:
+                return {}
+            if self._dev2cat_cache and self._dev2cat_cache[0] == cache_key:
+                return self._dev2cat_cache[1]
+
+            try:
+                cat2devs = read_json(cat2devs_file)
+            except json.JSONDecodeError:
+                cat2devs = {}
+            dev2cat = {}
+            for cat, devs in cat2devs.items():
+                for dev in devs:
+                    # Store both int and str versions for flexible lookup
+                    dev2cat[dev] = cat
+                    dev2cat[str(dev)] = cat
+            self._dev2cat_cache = (cache_key, dev2cat)
         except:
             dev2cat = {}
-        
+        return dev2cat
+
+    def _scan_events(self, events, target_pid=None):
+        """Walk the events once, collecting every aggregate the descriptive summaries need"""
+        dev2cat = self._load_dev2cat()
+
+        start_time = end_time = None
+        timestamp_count = 0
+        process_counts = Counter()
+        pid_counts = Counter()
+        pid_to_process = {}
+        device_counts = Counter()
+        device_paths = defaultdict(dict)  # dict keys: first-seen ordered, bounded path set
+        event_type_counts = Counter()
+        file_types = Counter()
+        path_analysis = Counter()
+        io_events = 0
+        target_events = 0
+        target_timestamps = []
+
         for event in events:
-            if 'details' in event:
-                # Get device identifier - use stdev+inode for regular files, kdev for device nodes
+            event_type = event.get('event', 'unknown')
+            timestamp = event.get('timestamp')
+            tgid = event.get('tgid')
+            process = event.get('process')
+            details = event.get('details')
+            pathname = details.get('pathname') if details else None
+
+            # Time range
+            if timestamp:
+                if timestamp_count:
+                    if timestamp < start_time:
+                        start_time = timestamp
+                    elif timestamp > end_time:
+                        end_time = timestamp
+                else:
+                    start_time = end_time = timestamp
+                timestamp_count += 1
+
+            # Processes and PIDs
+            process_counts[event.get('process', 'unknown')] += 1
+            if tgid:
+                if tgid > 0:
+                    pid_counts[tgid] += 1
+                if process:
+                    pid_to_process[tgid] = process
+
+            # Devices - use stdev+inode for regular files, kdev for device nodes
+            if details:
                 device_id = get_device_identifier(event)
                 if device_id:
                     device_counts[device_id] += 1
                     
                     # Track paths
-                    if 'pathname' in event['details'] and event['details']['pathname']:
-                        device_paths[device_id].add(event['details']['pathname'])
+                    if pathname:
+                        paths = device_paths[device_id]
+                        if len(paths) < _MAX_DEVICE_PATHS:
+                            paths[pathname] = None
+
+            event_type_counts[event_type] += 1
+
+            # I/O patterns
+            if event_type.endswith('_probe'):
+                io_events += 1
+                if pathname:
+                    # File extension analysis
+                    _, dot, ext = pathname.rpartition('.')
+                    if dot:
+                        ext = ext.lower()
+                        if len(ext) <= 4:  # Reasonable extension length
+                            file_types[ext] += 1
                     
-                    # Categorize device
-                    if device_id in dev2cat:
-                        device_categories[dev2cat[device_id]] += 1
+                    # Path pattern analysis
+                    if pathname.startswith('/'):
+                        path_analysis[pathname[1:].partition('/')[0]] += 1  # Top-level directory
+
+            # Target process activity
+            if tgid == target_pid:
+                target_events += 1
+                if timestamp:
+                    target_timestamps.append(timestamp)
+
+        # Categorize per distinct device / event type rather than per event
+        device_categories = Counter()
+        for device_id, count in device_counts.items():
+            if device_id in dev2cat:
+                device_categories[dev2cat[device_id]] += count
+
+        category_counts = Counter()
+        for event_type, count in event_type_counts.items():
+            category_counts[categorize_event(event_type)] += count
+
+        return {
+            'total_events': len(events),
+            'start_time': start_time,
+            'end_time': end_time,
+            'timestamp_count': timestamp_count,
+            'process_counts': process_counts,
+            'pid_counts': pid_counts,
+            'pid_to_process': pid_to_process,
+            'device_counts': device_counts,
+            'device_paths': device_paths,
+            'device_categories': device_categories,
+            'category_counts': category_counts,
+            'event_type_counts': event_type_counts,
+            'file_types': file_types,
+            'path_analysis': path_analysis,
+            'io_events': io_events,
+            'target_events': target_events,
+            'target_timestamps': target_timestamps
+        }
+
+    def _summarize_time_range(self, scan):
+        """Summarize the time range of events"""
+        if not scan['timestamp_count']:
+            return {'error': 'No timestamps found'}
+        
+        return {
+            'start_time': scan['start_time'],
+            'end_time': scan['end_time'],
+            'duration': scan['end_time'] - scan['start_time'],
+            'total_events': scan['timestamp_count']
+        }
+    
+    def _summarize_processes(self, scan):
+        """Summarize process distribution"""
+        process_counts = scan['process_counts']
+        pid_counts = scan['pid_counts']
+        
+        return {
+            'process_distribution': dict(process_counts.most_common(10)),
+            'pid_distribution': {str(k): v for k, v in pid_counts.most_common(10)},
+            'pid_to_process_map': {str(k): v for k, v in scan['pid_to_process'].items()},
+            'unique_processes': len(process_counts),
+            'unique_pids': len(pid_counts)
+        }
+    
+    def _summarize_devices(self, scan):
+        """Summarize device usage patterns"""
+        device_counts = scan['device_counts']
         
-        # Convert sets to lists and ensure string keys for JSON serialization
-        device_paths_dict = {str(k): list(v) for k, v in device_paths.items()}
+        # Convert path sets to lists and ensure string keys for JSON serialization
+        device_paths_dict = {str(k): list(v) for k, v in scan['device_paths'].items()}
         
         return {
-            'device_usage': {str(k): v for k, v in sorted(device_counts.items(), key=lambda x: (x[1], str(x[0])), reverse=True)[:20]},
+            'device_usage': {str(k): v for k, v in heapq.nlargest(20, device_counts.items(), key=lambda x: (x[1], str(x[0])))},
             'device_paths': device_paths_dict,
-            'category_usage': dict(device_categories),
+            'category_usage': dict(scan['device_categories']),
             'unique_devices': len(device_counts),
             'total_device_events': sum(device_counts.values())
         }
@@ -105,91 +243,57 @@ class DescriptivesAnalyser:
         
         return reads / writes
     
-    def analyze_categories(self, events):
-        """Analyze event categories"""
-        category_counts = defaultdict(int)
-        event_type_counts = Counter()
-        
-        for event in events:
-            event_type = event.get('event', 'unknown')
-            event_type_counts[event_type] += 1
-            
-            # Categorize event
-            category = categorize_event(event_type)
-            category_counts[category] += 1
+    def _summarize_categories(self, scan):
+        """Summarize event categories"""
+        category_counts = scan['category_counts']
         
         return {
             'category_distribution': dict(category_counts),
-            'event_type_distribution': dict(event_type_counts.most_common(15)),
+            'event_type_distribution': dict(scan['event_type_counts'].most_common(15)),
             'read_write_ratio': self._calculate_read_write_ratio(category_counts),
-            'io_patterns': self._analyze_io_patterns(events)
+            'io_patterns': self._summarize_io_patterns(scan)
         }
     
-        
-    def _analyze_io_patterns(self, events):
-        """Analyze I/O patterns"""
-        io_events = [e for e in events if e.get('event', '').endswith('_probe')]
-        
-        if not io_events:
+    def _summarize_io_patterns(self, scan):
+        """Summarize I/O patterns"""
+        if not scan['io_events']:
             return {'error': 'No I/O events found'}
         
-        # Analyze file types accessed
-        file_types = defaultdict(int)
-        path_analysis = defaultdict(int)
-        
-        for event in io_events:
-            if 'details' in event and 'pathname' in event['details']:
-                pathname = event['details']['pathname']
-                if pathname:
-                    # File extension analysis
-                    if '.' in pathname:
-                        ext = pathname.split('.')[-1].lower()
-                        if len(ext) <= 4:  # Reasonable extension length
-                            file_types[ext] += 1
-                    
-                    # Path pattern analysis
-                    if pathname.startswith('/'):
-                        parts = pathname.split('/')
-                        if len(parts) > 1:
-                            path_analysis[parts[1]] += 1  # Top-level directory
-        
         return {
-            'file_types': dict(sorted(file_types.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'path_patterns': dict(sorted(path_analysis.items(), key=lambda x: x[1], reverse=True)[:10]),
-            'total_io_events': len(io_events)
+            'file_types': dict(scan['file_types'].most_common(10)),
+            'path_patterns': dict(scan['path_analysis'].most_common(10)),
+            'total_io_events': scan['io_events']
         }
     
-
-    def analyze_temporal_patterns(self, events, target_pid):
-        """Analyze temporal patterns in the data"""
-        if not events:
+    def _summarize_temporal_patterns(self, scan, target_pid):
+        """Summarize temporal patterns of the target process"""
+        if not scan['total_events']:
             return {'error': 'No events to analyze'}
         
-        # Filter events for target PID
-        target_events = [e for e in events if e.get('tgid') == target_pid]
-        
+        target_events = scan['target_events']
         if not target_events:
             return {'error': f'No events found for PID {target_pid}'}
         
         # Time-based analysis
-        timestamps = [e.get('timestamp', 0) for e in target_events if e.get('timestamp')]
+        timestamps = scan['target_timestamps']
         if not timestamps:
             return {'error': 'No timestamps found'}
         
-        timestamps.sort()
+        timestamps = np.sort(np.asarray(timestamps, dtype=np.float64))
         
         # Calculate activity bursts
-        time_diffs = [timestamps[i+1] - timestamps[i] for i in range(len(timestamps)-1)]
-        avg_interval = np.mean(time_diffs) if time_diffs else 0
+        time_diffs = np.diff(timestamps)
+        avg_interval = time_diffs.mean() if time_diffs.size else 0
         
         # Find activity bursts (intervals much smaller than average)
         burst_threshold = avg_interval * 0.1 if avg_interval > 0 else 0.001
-        bursts = sum(1 for diff in time_diffs if diff < burst_threshold)
+        bursts = int((time_diffs < burst_threshold).sum())
         
+        time_span = float(timestamps[-1] - timestamps[0])
         return {
-            'target_pid_events': len(target_events),
-            'time_span': timestamps[-1] - timestamps[0] if len(timestamps) > 1 else 0,
+            'target_pid_events': target_events,
+            'time_span': time_span,
             'average_event_interval': avg_interval,
             'activity_bursts': bursts,
-            'events_per_second': len(target_events) / (timestamps[-1] - timestamps[0]) if len(timestamps) > 1 and timestamps[-1] != timestamps[0] else 0
-        }
\ No newline at end of file
+            'events_per_second': target_events / time_span if time_span else 0
+        }
@@ -1,11 +1,24 @@
-from .base_utils import analyze_socket_types
+from .base_utils import analyze_socket_types, _EMPTY_DETAILS, _INV_MB
+
+# (data_transfer key, icon, text template, text for transfers below 0.01 MB)
+_TRANSFER_INSIGHTS = (
+    ('total', '📊',
+     "Total data transferred: <strong>{total_mb:.2f} MB</strong> (↑ {sent_mb:.2f} MB, ↓ {received_mb:.2f} MB)".format_map,
+     "Minimal data transfer detected (< 0.01 MB)"),
+    ('tcp', '📡',
+     "TCP data: <strong>{total_mb:.2f} MB</strong> (↑ {sent_mb:.2f} MB, ↓ {received_mb:.2f} MB)".format_map,
+     "TCP data: minimal transfer detected (< 0.01 MB)"),
+    ('udp', '📶',
+     "UDP data: <strong>{total_mb:.2f} MB</strong> (↑ {sent_mb:.2f} MB, ↓ {received_mb:.2f} MB)".format_map,
+     "UDP data: minimal transfer detected (< 0.01 MB)"),
+)
 
 def get_event_size(event):
     """Helper method to extract size information from an event"""
     if not event or 'details' not in event:
         return 0
         
-    details = event.get('details', {})
+    details = event.get('details') or _EMPTY_DETAILS
     
     # Try different field names for size
     size = details.get('size', details.get('len', 0))
@@ -59,106 +72,80 @@ def generate_network_insights(network_analysis):
                 'text': f"<strong>{data_transfer['metadata']['unique_packets']}</strong> unique network packets analyzed"
             })
         
-        # Total data transfer
-        total_mb = data_transfer.get('total', {}).get('total_mb', 0)
-        total_sent_mb = data_transfer.get('total', {}).get('sent_mb', 0)
-        total_received_mb = data_transfer.get('total', {}).get('received_mb', 0)
-        
-        if total_mb > 0.01:  # Only show if significant
-            insights.append({
-                'icon': '📊',
-                'text': f"Total data transferred: <strong>{total_mb:.2f} MB</strong> " +
-                       f"(↑ {total_sent_mb:.2f} MB, ↓ {total_received_mb:.2f} MB)"
-            })
-        elif total_mb > 0:
-            insights.append({
-                'icon': '📊',
-                'text': "Minimal data transfer detected (< 0.01 MB)"
-            })
-        
-        # TCP data transfer
-        tcp_total_mb = data_transfer.get('tcp', {}).get('total_mb', 0)
-        tcp_sent_mb = data_transfer.get('tcp', {}).get('sent_mb', 0)
-        tcp_received_mb = data_transfer.get('tcp', {}).get('received_mb', 0)
-        
-        if tcp_total_mb > 0.01:  # Only show if significant
-            insights.append({
-                'icon': '📡',
-                'text': f"TCP data: <strong>{tcp_total_mb:.2f} MB</strong> " +
-                       f"(↑ {tcp_sent_mb:.2f} MB, ↓ {tcp_received_mb:.2f} MB)"
-            })
-        elif tcp_total_mb > 0:
-            insights.append({
-                'icon': '📡',
-                'text': "TCP data: minimal transfer detected (< 0.01 MB)"
-            })
-        
-        # UDP data transfer
-        udp_total_mb = data_transfer.get('udp', {}).get('total_mb', 0)
-        udp_sent_mb = data_transfer.get('udp', {}).get('sent_mb', 0)
-        udp_received_mb = data_transfer.get('udp', {}).get('received_mb', 0)
-        
-        if udp_total_mb > 0.01:  # Only show if significant
-            insights.append({
-                'icon': '📶',
-                'text': f"UDP data: <strong>{udp_total_mb:.2f} MB</strong> " +
-                       f"(↑ {udp_sent_mb:.2f} MB, ↓ {udp_received_mb:.2f} MB)"
-            })
-        elif udp_total_mb > 0:
-            insights.append({
-                'icon': '📶',
-                'text': "UDP data: minimal transfer detected (< 0.01 MB)"
-            })
+        # Total, TCP and UDP data transfer
+        for key, icon, format_transfer, minimal_text in _TRANSFER_INSIGHTS:
+            stats = data_transfer.get(key, {})
+            total_mb = stats.get('total_mb', 0)
+            
+            if total_mb > 0.01:  # Only show if significant
+                insights.append({
+                    'icon': icon,
+                    'text': format_transfer({'total_mb': total_mb,
+                                             'sent_mb': stats.get('sent_mb', 0),
+                                             'received_mb': stats.get('received_mb', 0)})
+                })
+            elif total_mb > 0:
+                insights.append({
+                    'icon': icon,
+                    'text': minimal_text
+                })
         
         # Top destination by data transfer
         tcp_destinations = data_transfer['tcp']['per_destination']
         if tcp_destinations:
-            top_tcp_dest = max(tcp_destinations.items(), key=lambda x: x[1]['total_bytes'], default=(None, None))
-            if top_tcp_dest[0] and top_tcp_dest[1]['total_mb'] > 0:
+            top_dest = max(tcp_destinations, key=lambda k: tcp_destinations[k]['total_bytes'])
+            top_dest_mb = tcp_destinations[top_dest]['total_mb']
+            if top_dest and top_dest_mb > 0:
                 insights.append({
                     'icon': '🔝',
-                    'text': f"Top TCP destination: <strong>{top_tcp_dest[0]}</strong> " +
-                           f"({top_tcp_dest[1]['total_mb']:.2f} MB)"
+                    'text': f"Top TCP destination: <strong>{top_dest}</strong> " +
+                           f"({top_dest_mb:.2f} MB)"
                 })
     
-    # Add socket type insights
-    socket_types = analyze_socket_types(network_analysis.get('_events', []))
-    
+    # Add socket type insights (cached on the analysis so repeated calls skip the rescan)
+    socket_types = network_analysis.get('_socket_types')
+    if socket_types is None:
+        socket_types = analyze_socket_types(network_analysis.get('_events', []))
+        network_analysis['_socket_types'] = socket_types
+
     # If no socket types detected, try to infer from network events
     if socket_types['total_sockets'] == 0 and network_analysis.get('_events'):
-        events = network_analysis.get('_events', [])
-        has_tcp = any('tcp' in e.get('event', '').lower() for e in events)
-        has_udp = any('udp' in e.get('event', '').lower() for e in events)
+        # Count TCP/UDP events and their sizes in a single sweep
+        tcp_count = tcp_bytes = udp_count = udp_bytes = 0
+        for e in network_analysis['_events']:
+            event_name = e.get('event', '').lower()
+            if 'tcp' in event_name:
+                tcp_count += 1
+                tcp_bytes += get_event_size(e)
+            if 'udp' in event_name:
+                udp_count += 1
+                udp_bytes += get_event_size(e)
         
-        if has_tcp:
+        if tcp_count:
             socket_types['types']['SOCK_STREAM'] = {
-                'count': sum(1 for e in events if 'tcp' in e.get('event', '').lower()),
-                'data_bytes': sum(get_event_size(e) for e in events if 'tcp' in e.get('event', '').lower()),
-                'data_mb': 0.0,
+                'count': tcp_count,
+                'data_bytes': tcp_bytes,
+                'data_mb': round(tcp_bytes * _INV_MB, 2),
                 'description': 'TCP'
             }
             socket_types['total_sockets'] += 1
         
-        if has_udp:
+        if udp_count:
             socket_types['types']['SOCK_DGRAM'] = {
-                'count': sum(1 for e in events if 'udp' in e.get('event', '').lower()),
-                'data_bytes': sum(get_event_size(e) for e in events if 'udp' in e.get('event', '').lower()),
-                'data_mb': 0.0,
+                'count': udp_count,
+                'data_bytes': udp_bytes,
+                'data_mb': round(udp_bytes * _INV_MB, 2),
                 'description': 'UDP'
             }
             socket_types['total_sockets'] += 1
-        
-        # Calculate MB values
-        bytes_to_mb = lambda b: round(b / (1024 * 1024), 2)
-        for socket_type in socket_types['types']:
-            socket_types['types'][socket_type]['data_mb'] = bytes_to_mb(socket_types['types'][socket_type]['data_bytes'])
     
     # Add insights based on socket types
     if socket_types['types']:
         # Get the most common socket type
-        most_common_type = max(socket_types['types'].items(), key=lambda x: x[1]['count'], default=(None, None))
-        if most_common_type[0]:
-            socket_type, data = most_common_type
+        types = socket_types['types']
+        socket_type = max(types, key=lambda k: types[k]['count'])
+        if socket_type:
+            data = types[socket_type]
             data_mb = data.get('data_mb', 0)
             
             if data_mb > 0.01:
@@ -1,6 +1,6 @@
-from collections import defaultdict
+from collections import Counter, defaultdict
 from . import get_logger
-from .base_utils import analyze_socket_types
+from .base_utils import analyze_socket_types, _EMPTY_DETAILS, _INV_MB
 
 class NetworkAnalyser:
     def __init__(self):
@@ -39,32 +39,24 @@ class NetworkAnalyser:
     
     def analyze_network_events(self, events):
         """Analyze network-related events"""
-        network_events = [e for e in events if e.get('details').get('family') in ('AF_INET', 'AF_INET6') or 'tcp' in e.get('event', '') or 'udp' in e.get('event', '')]
+        network_events = [e for e in events if (e.get('details') or _EMPTY_DETAILS).get('family') in ('AF_INET', 'AF_INET6') or 'tcp' in e.get('event', '') or 'udp' in e.get('event', '')]
         if not network_events:
             return {'no_network_events': True}
         
-        tcp_states = defaultdict(int)
-        connections = defaultdict(int)
-        
         # Track data transfer
         data_transfer = self._analyze_data_transfer(events)
         
         # Analyze socket types
         socket_types = analyze_socket_types(network_events)
 
-        for event in network_events:
-            if event.get('event') == 'inet_sock_set_state' and 'details' in event:
-                details = event['details']
-                if 'newstate' in details:
-                    tcp_states[details['newstate']] += 1
-                
-                if 'daddr' in details:
-                    connections[details['daddr']] += 1
+        state_changes = [e['details'] for e in network_events if e.get('event') == 'inet_sock_set_state' and 'details' in e]
+        tcp_states = Counter(d['newstate'] for d in state_changes if 'newstate' in d)
+        connections = Counter(d['daddr'] for d in state_changes if 'daddr' in d)
         
         return {
             'network_events_count': len(network_events),
             'tcp_state_transitions': dict(tcp_states),
-            'connection_destinations': dict(sorted(connections.items(), key=lambda x: x[1], reverse=True)[:10]),
+            'connection_destinations': dict(connections.most_common(10)),
             'data_transfer': data_transfer,
             'socket_types': socket_types,
             '_events': events  # Store events for further analysis
@@ -107,14 +99,15 @@ class NetworkAnalyser:
         
         # Filter for TCP/UDP send/receive events
         for event in events:
-            event_name = event.get('event', '')
-            details = event.get('details', {})
-            process = event.get('process', 'unknown')
-            timestamp = event.get('timestamp', 0)
+            details = event.get('details')
             
             # Skip events without details
             if not details:
                 continue
+            
+            event_name = event.get('event', '')
+            process = event.get('process', 'unknown')
+            timestamp = event.get('timestamp', 0)
                 
             # Get socket file descriptor for deduplication
             socket_fd = details.get('sock_fd', details.get('fd', -1))
@@ -228,20 +221,13 @@ class NetworkAnalyser:
                 data_transfer['udp']['per_process'][process]['received_bytes'] += size
         
         # Convert bytes to megabytes for easier reading
-        bytes_to_mb = lambda b: round(b / (1024 * 1024), 2)
-        
-        # Calculate MB values
-        data_transfer['tcp']['sent_mb'] = bytes_to_mb(data_transfer['tcp']['sent_bytes'])
-        data_transfer['tcp']['received_mb'] = bytes_to_mb(data_transfer['tcp']['received_bytes'])
-        data_transfer['tcp']['total_mb'] = bytes_to_mb(data_transfer['tcp']['sent_bytes'] + data_transfer['tcp']['received_bytes'])
-        
-        data_transfer['udp']['sent_mb'] = bytes_to_mb(data_transfer['udp']['sent_bytes'])
-        data_transfer['udp']['received_mb'] = bytes_to_mb(data_transfer['udp']['received_bytes'])
-        data_transfer['udp']['total_mb'] = bytes_to_mb(data_transfer['udp']['sent_bytes'] + data_transfer['udp']['received_bytes'])
-        
-        data_transfer['total']['sent_mb'] = bytes_to_mb(data_transfer['total']['sent_bytes'])
-        data_transfer['total']['received_mb'] = bytes_to_mb(data_transfer['total']['received_bytes'])
-        data_transfer['total']['total_mb'] = bytes_to_mb(data_transfer['total']['sent_bytes'] + data_transfer['total']['received_bytes'])
+        for protocol in ('tcp', 'udp', 'total'):
+            stats = data_transfer[protocol]
+            sent_bytes = stats['sent_bytes']
+            received_bytes = stats['received_bytes']
+            stats['sent_mb'] = round(sent_bytes * _INV_MB, 2)
+            stats['received_mb'] = round(received_bytes * _INV_MB, 2)
+            stats['total_mb'] = round((sent_bytes + received_bytes) * _INV_MB, 2)
         
         # Convert defaultdicts to regular dicts for JSON serialization
         data_transfer['tcp']['per_destination'] = dict(data_transfer['tcp']['per_destination'])
@@ -250,15 +236,10 @@ class NetworkAnalyser:
         data_transfer['udp']['per_process'] = dict(data_transfer['udp']['per_process'])
         
         # Sort destinations by total data transferred
-        tcp_destinations = data_transfer['tcp']['per_destination']
-        for dest in tcp_destinations:
-            tcp_destinations[dest]['total_bytes'] = tcp_destinations[dest]['sent_bytes'] + tcp_destinations[dest]['received_bytes']
-            tcp_destinations[dest]['total_mb'] = bytes_to_mb(tcp_destinations[dest]['total_bytes'])
-        
-        udp_destinations = data_transfer['udp']['per_destination']
-        for dest in udp_destinations:
-            udp_destinations[dest]['total_bytes'] = udp_destinations[dest]['sent_bytes'] + udp_destinations[dest]['received_bytes']
-            udp_destinations[dest]['total_mb'] = bytes_to_mb(udp_destinations[dest]['total_bytes'])
+        for protocol in ('tcp', 'udp'):
+            for dest_stats in data_transfer[protocol]['per_destination'].values():
+                dest_stats['total_bytes'] = dest_stats['sent_bytes'] + dest_stats['received_bytes']
+                dest_stats['total_mb'] = round(dest_stats['total_bytes'] * _INV_MB, 2)
         
         # Add metadata about the analysis
         data_transfer['metadata'] = {
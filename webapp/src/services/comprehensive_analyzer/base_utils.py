@@ -3,7 +3,7 @@ Base utilities and common functions for comprehensive analysis
 """
 
 import logging
-from ..utils import get_device_identifier, is_legitimate_sensitive_access, make_json_serializable
+from ..utils import ACCESS_EVENTS, get_device_identifier, is_legitimate_sensitive_access, make_json_serializable
 
 
 class BaseAnalyzer:
@@ -46,7 +46,7 @@ class DeviceUtils:
 
         if 'details' in event:
             # Check if this is a valid file/device access event
-            if event['event'] in ['read_probe', 'write_probe', 'ioctl_probe']:
+            if event['event'] in ACCESS_EVENTS:
                 kdev = event['details'].get('k_dev') or event['details'].get('k__dev')
                 stdev = event['details'].get('s_dev_inode')
                 inode = event['details'].get('inode')
@@ -80,7 +80,7 @@ class SensitiveDataUtils:
 
         if 'details' in event:
             device = event['details'].get('k_dev') or event['details'].get('k__dev')
-            if (event['event'] in ['read_probe', 'write_probe', 'ioctl_probe']) and device and device != 0:
+            if (event['event'] in ACCESS_EVENTS) and device and device != 0:
                 filtered = False
                 try:
                     if 'pathname' in event['details'] and event['details']['pathname'] in filtered_pathnames:
@@ -91,7 +91,7 @@ class SensitiveDataUtils:
         if track_sensitive and sensitive_resources and 'details' in event:
             try:
                 # Only check events that are actual file/device access operations
-                if event['event'] not in ['read_probe', 'write_probe', 'ioctl_probe']:
+                if event['event'] not in ACCESS_EVENTS:
                     if not track_sensitive:
                         return filtered
                     return filtered, None
@@ -108,7 +108,7 @@ class SensitiveDataUtils:
                             # Check direct match in device list
                             if device_id_str in device_list:
                                 # Verify this is actually accessing sensitive data, not just any file on same device
-                                pathname = event['details'].get('pathname', '').lower()
+                                pathname = event['details'].get('pathname', '')
                                 if SensitiveDataUtils.is_legitimate_sensitive_access(pathname, dtype):
                                     sensitive_type = 'call_logs' if dtype == 'call_logs' else dtype
                                     break
@@ -3,8 +3,8 @@ File Analysis Module
 Core file analysis with windowed approach and device categorization
 """
 
-import json
 import traceback
+from ..utils import read_json
 from .base_utils import BaseAnalyzer, DeviceUtils, SensitiveDataUtils, EventUtils
 
 
@@ -47,8 +47,7 @@ class FileAnalyzer(BaseAnalyzer):
             cat2devs_file = self.config.MAPPINGS_DIR / 'cat2devs.txt'
             if cat2devs_file.exists():
                 self.logger.info(f"Loading device category mapping from: {cat2devs_file}")
-                with open(cat2devs_file, 'r') as f:
-                    category_mapping = json.load(f)
+                category_mapping = read_json(cat2devs_file)
 
                 self.logger.info(f"Successfully loaded device category mapping with {len(category_mapping)} categories")
 
@@ -4,10 +4,19 @@ Analyzes network communication patterns and relationships
 """
 
 from .base_utils import BaseAnalyzer
+from ..utils import filter_events_by_pid
 
 
 class NetworkAnalyzer(BaseAnalyzer):
     """Network flow analysis for communication pattern detection"""
+
+    # Send/receive events -> (result list, socket field, size field, formatted size field, direction)
+    _MESSAGE_EVENTS = {
+        'tcp_sendmsg': ('tcp_connections', 'sk', 'size', 'size_formatted', 'send'),
+        'tcp_recvmsg': ('tcp_connections', 'sk', 'len', 'len_formatted', 'receive'),
+        'udp_sendmsg': ('udp_communications', 'sock', 'len', 'len_formatted', 'send'),
+        'udp_recvmsg': ('udp_communications', 'sk', 'len', 'len_formatted', 'receive'),
+    }
     
     def __init__(self, config_class):
         super().__init__(config_class, "NetworkAnalyzer")
@@ -37,93 +46,37 @@ class NetworkAnalyzer(BaseAnalyzer):
         process_connections = {}
         communication_flows = []
 
-        for event in events:
-            if target_pid and event.get('tgid') != target_pid:
-                continue
+        # Filter to the target process once instead of testing inside the loop
+        if target_pid:
+            events = filter_events_by_pid(events, target_pid)
 
+        for event in events:
             event_name = event.get('event', '')
             timestamp = event.get('timestamp')
             process = event.get('process')
             details = event.get('details', {})
             pid = event.get('tgid')
 
-            # TCP communications (if present)
-            if event_name == 'tcp_sendmsg':
-                tcp_send = {
-                    'timestamp': timestamp,
-                    'pid': pid,
-                    'process': process,
-                    'socket': details.get('sk'),
-                    'size': details.get('size'),
-                    'size_formatted': details.get('size_formatted'),
-                    'src_ip': details.get('src_ip'),
-                    'src_ip_readable': details.get('src_ip_readable'),
-                    'dst_ip': details.get('dst_ip'),
-                    'dst_ip_readable': details.get('dst_ip_readable'),
-                    'src_port': details.get('src_port'),
-                    'dst_port': details.get('dst_port'),
-                    'direction': 'send',
-                    'details': details
-                }
-                network_analysis['tcp_connections'].append(tcp_send)
-
-            elif event_name == 'tcp_recvmsg':
-                tcp_recv = {
-                    'timestamp': timestamp,
-                    'pid': pid,
-                    'process': process,
-                    'socket': details.get('sk'),
-                    'len': details.get('len'),
-                    'len_formatted': details.get('len_formatted'),
-                    'src_ip': details.get('src_ip'),
-                    'src_ip_readable': details.get('src_ip_readable'),
-                    'dst_ip': details.get('dst_ip'),
-                    'dst_ip_readable': details.get('dst_ip_readable'),
-                    'src_port': details.get('src_port'),
-                    'dst_port': details.get('dst_port'),
-                    'direction': 'receive',
-                    'details': details
-                }
-                network_analysis['tcp_connections'].append(tcp_recv)
-
-            # UDP communications (if present)
-            elif event_name == 'udp_sendmsg':
-                udp_send = {
-                    'timestamp': timestamp,
-                    'pid': pid,
-                    'process': process,
-                    'socket': details.get('sock'),
-                    'len': details.get('len'),
-                    'len_formatted': details.get('len_formatted'),
-                    'src_ip': details.get('src_ip'),
-                    'src_ip_readable': details.get('src_ip_readable'),
-                    'dst_ip': details.get('dst_ip'),
-                    'dst_ip_readable': details.get('dst_ip_readable'),
-                    'src_port': details.get('src_port'),
-                    'dst_port': details.get('dst_port'),
-                    'direction': 'send',
-                    'details': details
-                }
-                network_analysis['udp_communications'].append(udp_send)
-
-            elif event_name == 'udp_recvmsg':
-                udp_recv = {
+            # TCP/UDP send and receive messages (if present)
+            message_spec = self._MESSAGE_EVENTS.get(event_name)
+            if message_spec:
+                target, socket_key, size_key, formatted_key, direction = message_spec
+                network_analysis[target].append({
                     'timestamp': timestamp,
                     'pid': pid,
                     'process': process,
-                    'socket': details.get('sk'),
-                    'len': details.get('len'),
-                    'len_formatted': details.get('len_formatted'),
+                    'socket': details.get(socket_key),
+                    size_key: details.get(size_key),
+                    formatted_key: details.get(formatted_key),
                     'src_ip': details.get('src_ip'),
                     'src_ip_readable': details.get('src_ip_readable'),
                     'dst_ip': details.get('dst_ip'),
                     'dst_ip_readable': details.get('dst_ip_readable'),
                     'src_port': details.get('src_port'),
                     'dst_port': details.get('dst_port'),
-                    'direction': 'receive',
+                    'direction': direction,
                     'details': details
-                }
-                network_analysis['udp_communications'].append(udp_recv)
+                })
 
             # TCP connect events
             elif event_name == 'tcp_connect':
@@ -1,13 +1,111 @@
 import os
 import json
 import csv
+import gc
 import re
 import logging
 import socket
 import struct
+import sys
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1024)
+def _categorize_event_name(event_name):
+    """Map an event name to its visualization category (depends on the name only, so results are cached)"""
+    # Read operations (traditional filesystem reads + hardware reads)
+    if event_name in ['read_probe'] or any(keyword in event_name for keyword in ['read', 'recv']):
+        return 'read'
+    
+    # Write operations (traditional filesystem writes + hardware writes) 
+    elif (event_name in ['write_probe', 'tracing_mark_write'] or 
+          any(keyword in event_name for keyword in ['write', 'send', 'enable', 'prepare', 'vote'])):
+        return 'write'
+    
+    # IOCTL and hardware control operations
+    elif (event_name in ['ioctl_probe', 'android_vh_blk_account_io_done_handler', 'ioc_timer_fn'] or
+          any(keyword in event_name for keyword in ['ioctl', 'clk', 'runtime', 'suspend', 'resume', 'hw_'])):
+        return 'ioctl'
+    
+    # Binder and IPC operations  
+    elif (event_name in ['binder_transaction', 'binder_transaction_received'] or
+          any(keyword in event_name for keyword in ['binder', 'interrupt'])):
+        return 'binder'
+    
+    # Network operations (including audio/communication subsystems)
+    elif (event_name in ['tcp_sendmsg', 'tcp_recvmsg', 'udp_sendmsg', 'udp_recvmsg',
+                       '__sys_socket', '__sys_connect', '__sys_bind', 'sock_sendmsg', 'inet_sock_set_state'] or
+          any(keyword in event_name for keyword in ['audio', 'bolero', 'swrm', 'digital_cdc', 'lpass_hw', 'sock', 'inet'])):
+        return 'network'
+    
+    else:
+        return 'other'
+
+
+# Traditional system call events
+_TRADITIONAL_EVENTS = frozenset([
+    # File system operations
+    'read_probe', 'write_probe', 'ioctl_probe',
+    # IPC operations
+    'inet_sock_set_state', 'binder_transaction', 'binder_transaction_received',
+    # Network operations
+    'tcp_sendmsg', 'tcp_recvmsg', 'udp_sendmsg', 'udp_recvmsg',
+    '__sys_socket', '__sys_connect', '__sys_bind', 'sock_sendmsg',
+    # Security operations
+    'ptrace_attach', '__arm64_sys_setuid', '__arm64_sys_setresuid', 
+    '__arm64_sys_setresgid', '__arm64_sys_capset', '__arm64_sys_mprotect',
+    # Process operations
+    '__arm64_sys_execve', 'load_elf_binary', 'sched_process_fork', 'sched_process_exec',
+    # Memory operations
+    'mmap_probe',
+    # Bluetooth operations
+    'hci_sock_sendmsg', 'sco_sock_sendmsg', 'l2cap_sock_sendmsg',
+    # Device-specific operations
+    'aoc_service_write_message'
+])
+
+# Hardware and low-level events (new support)
+_HARDWARE_EVENTS = frozenset([
+    # Block I/O
+    'android_vh_blk_account_io_done_handler', 'ioc_timer_fn',
+    # System tracing
+    'tracing_mark_write',
+    # Audio subsystem
+    'audio_ext_clk_prepare', 'audio_ext_clk_unprepare',
+    'bolero_runtime_resume', 'bolero_runtime_suspend', 'bolero_clk_rsc_request_clock',
+    'digital_cdc_rsc_mgr_hw_vote_enable', 'digital_cdc_rsc_mgr_hw_vote_disable',
+    'rx_macro_mclk_enable', 'rx_swrm_clock',
+    'swrm_mstr_interrupt', 'swrm_request_hw_vote', 'swrm_runtime_resume', 'swrm_runtime_suspend', 'swrm_clk_request',
+    'lpass_hw_vote_prepare', 'lpass_hw_vote_unprepare',
+    # Power management
+    'pm_runtime', 'lpi_pinctrl_runtime_resume', 'lpi_pinctrl_runtime_suspend',
+    # Clock management
+    'clk_cnt', 'hw_clk_en'
+])
+
+# Events relevant for visualization, checked with a single set lookup
+_VISUALIZATION_EVENTS = _TRADITIONAL_EVENTS | _HARDWARE_EVENTS
+
+# Generic name patterns that might be relevant
+_RELEVANT_PATTERNS = ('handle', 'enable', 'status')
+
+
+@lru_cache(maxsize=1024)
+def _is_visualization_relevant_name(event_name):
+    """Check if an event name is relevant for visualization (depends on the name only, so results are cached)"""
+    # Check both traditional and hardware events
+    if event_name in _VISUALIZATION_EVENTS:
+        return True
+        
+    # Also check for generic patterns that might be relevant
+    if len(event_name) < 50:  # Avoid very long event names
+        return any(pattern in event_name for pattern in _RELEVANT_PATTERNS)
+    
+    return False
+
+
 class TraceProcessor:
     """Process .trace files and convert them to JSON for visualization"""
 
@@ -172,8 +270,6 @@ class TraceProcessor:
 
     def _find_process(self, events, filepath):
         """Find the target process from the trace events using shortened name matching"""
-        from collections import Counter
-
         # Determine application name from trace filename
         basename = os.path.splitext(os.path.basename(filepath))[0]
         app_name = basename.split('.')[0]  # part before first dot
@@ -262,92 +358,11 @@ class TraceProcessor:
     
     def _categorize_event(self, event):
         """Categorize event for visualization purposes using simplified categories"""
-        event_name = event.get('event', '')
-        
-        # Read operations (traditional filesystem reads + hardware reads)
-        if event_name in ['read_probe'] or any(keyword in event_name for keyword in ['read', 'recv']):
-            return 'read'
-        
-        # Write operations (traditional filesystem writes + hardware writes) 
-        elif (event_name in ['write_probe', 'tracing_mark_write'] or 
-              any(keyword in event_name for keyword in ['write', 'send', 'enable', 'prepare', 'vote'])):
-            return 'write'
-        
-        # IOCTL and hardware control operations
-        elif (event_name in ['ioctl_probe', 'android_vh_blk_account_io_done_handler', 'ioc_timer_fn'] or
-              any(keyword in event_name for keyword in ['ioctl', 'clk', 'runtime', 'suspend', 'resume', 'hw_'])):
-            return 'ioctl'
-        
-        # Binder and IPC operations  
-        elif (event_name in ['binder_transaction', 'binder_transaction_received'] or
-              any(keyword in event_name for keyword in ['binder', 'interrupt'])):
-            return 'binder'
-        
-        # Network operations (including audio/communication subsystems)
-        elif (event_name in ['tcp_sendmsg', 'tcp_recvmsg', 'udp_sendmsg', 'udp_recvmsg',
-                           '__sys_socket', '__sys_connect', '__sys_bind', 'sock_sendmsg', 'inet_sock_set_state'] or
-              any(keyword in event_name for keyword in ['audio', 'bolero', 'swrm', 'digital_cdc', 'lpass_hw', 'sock', 'inet'])):
-            return 'network'
-        
-        else:
-            return 'other'
+        return _categorize_event_name(event.get('event', ''))
 
     def _is_visualization_relevant(self, event):
         """Check if an event is relevant for visualization"""
-        event_name = event.get('event', '')
-        
-        # Traditional system call events
-        traditional_events = [
-            # File system operations
-            'read_probe', 'write_probe', 'ioctl_probe',
-            # IPC operations
-            'inet_sock_set_state', 'binder_transaction', 'binder_transaction_received',
-            # Network operations
-            'tcp_sendmsg', 'tcp_recvmsg', 'udp_sendmsg', 'udp_recvmsg',
-            '__sys_socket', '__sys_connect', '__sys_bind', 'sock_sendmsg',
-            # Security operations
-            'ptrace_attach', '__arm64_sys_setuid', '__arm64_sys_setresuid', 
-            '__arm64_sys_setresgid', '__arm64_sys_capset', '__arm64_sys_mprotect',
-            # Process operations
-            '__arm64_sys_execve', 'load_elf_binary', 'sched_process_fork', 'sched_process_exec',
-            # Memory operations
-            'mmap_probe',
-            # Bluetooth operations
-            'hci_sock_sendmsg', 'sco_sock_sendmsg', 'l2cap_sock_sendmsg',
-            # Device-specific operations
-            'aoc_service_write_message'
-        ]
-        
-        # Hardware and low-level events (new support)
-        hardware_events = [
-            # Block I/O
-            'android_vh_blk_account_io_done_handler', 'ioc_timer_fn',
-            # System tracing
-            'tracing_mark_write',
-            # Audio subsystem
-            'audio_ext_clk_prepare', 'audio_ext_clk_unprepare',
-            'bolero_runtime_resume', 'bolero_runtime_suspend', 'bolero_clk_rsc_request_clock',
-            'digital_cdc_rsc_mgr_hw_vote_enable', 'digital_cdc_rsc_mgr_hw_vote_disable',
-            'rx_macro_mclk_enable', 'rx_swrm_clock',
-            'swrm_mstr_interrupt', 'swrm_request_hw_vote', 'swrm_runtime_resume', 'swrm_runtime_suspend', 'swrm_clk_request',
-            'lpass_hw_vote_prepare', 'lpass_hw_vote_unprepare',
-            # Power management
-            'pm_runtime', 'lpi_pinctrl_runtime_resume', 'lpi_pinctrl_runtime_suspend',
-            # Clock management
-            'clk_cnt', 'hw_clk_en'
-        ]
-        
-        # Check both traditional and hardware events
-        if event_name in traditional_events or event_name in hardware_events:
-            return True
-            
-        # Also check for generic patterns that might be relevant
-        relevant_patterns = ['handle', 'enable', 'status']
-        for pattern in relevant_patterns:
-            if pattern in event_name and len(event_name) < 50:  # Avoid very long event names
-                return True
-        
-        return False
+        return _is_visualization_relevant_name(event.get('event', ''))
 
     def _parse_ftrace_log(self, filepath, max_events=None, progress_callback=None):
         """
@@ -379,16 +394,18 @@ class TraceProcessor:
                 match = trace_pattern.match(line)
                 if match:
                     # Extract main fields from the log line
-                    process = match.group('process')
+                    # (process/flags/event repeat across lines, so intern them to share one
+                    # string object per value and make later dict lookups identity hits)
+                    process = sys.intern(match.group('process'))
                     tid = int(match.group('tid'))      # Thread ID (TID) -> PID as integer
                     try:
                         tgid = int(match.group('tgid'))    # Thread Group ID (TGID) as integer
                     except ValueError:
                         tgid = -1 # When tgid is not known by the system use -1
                     cpu = int(match.group('cpu'))      # CPU as integer
-                    flags = match.group('flags')
+                    flags = sys.intern(match.group('flags'))
                     timestamp = float(match.group('timestamp'))  # Timestamp as float
-                    event = match.group('event')
+                    event = sys.intern(match.group('event'))
                     details = match.group('details')
 
                     # Parse the details section (key-value pairs)
@@ -442,7 +459,6 @@ class TraceProcessor:
                     # Memory management for very large files
                     if len(parsed_events) % 10000 == 0 and len(parsed_events) > 0:
                         # Force garbage collection every 10k events to prevent memory bloat
-                        import gc
                         gc.collect()
                 else:
                     # Skip printing invalid lines to reduce noise
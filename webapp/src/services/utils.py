@@ -1,5 +1,39 @@
+import json
+import re
 from collections import defaultdict, Counter
 
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib parser is used otherwise
+    orjson = None
+
+# File/device access events that can touch sensitive resources
+ACCESS_EVENTS = frozenset(('read_probe', 'write_probe', 'ioctl_probe'))
+
+# Pathname fragments identifying each sensitive data type
+_SENSITIVE_PATTERNS = {
+    'contacts': ('contacts2.db', 'contacts.db', 'people.db', '/contacts/', 'addressbook'),
+    'sms': ('mmssms.db', 'sms.db', 'mms.db', '/sms/', '/messages/', 'telephony.db'),
+    'calendar': ('calendar.db', 'calendarconfig.db', '/calendar/', 'events.db'),
+    'call_logs': ('calllog.db', 'calls.db', '/calllog/', 'call_log.db')
+}
+
+# Android provider / broader keywords that also identify each data type
+_SENSITIVE_PROVIDER_KEYWORDS = {
+    'contacts': ('com.android.contacts', 'contacts'),
+    'sms': ('com.android.providers.telephony', 'telephony'),
+    'calendar': ('com.android.providers.calendar', 'calendar'),
+    'call_logs': ('calllog', 'calls'),
+    '': ('calllog', 'calls')
+}
+
+# One compiled, case-insensitive alternation per data type, so a pathname is checked
+# in a single scan without allocating a lowercased copy
+_SENSITIVE_REGEXES = {
+    data_type: re.compile('|'.join(map(re.escape, _SENSITIVE_PATTERNS.get(data_type, ()) + keywords)), re.IGNORECASE)
+    for data_type, keywords in _SENSITIVE_PROVIDER_KEYWORDS.items()
+}
+
 def get_device_identifier(e):
         """Get device identifier - use stdev+inode for regular files, kdev for device nodes"""
         if 'details' not in e:
@@ -21,6 +55,10 @@ def get_device_identifier(e):
 
         return None
 
+def filter_events_by_pid(events, target_pid):
+        """Return the events whose thread group ID (tgid) matches target_pid"""
+        return [e for e in events if e.get('tgid') == target_pid]
+
 def is_legitimate_sensitive_access(pathname, data_type):
         """
         Validate that the pathname actually represents access to sensitive data
@@ -29,38 +67,21 @@ def is_legitimate_sensitive_access(pathname, data_type):
         if not pathname:
             return False
             
-        pathname_lower = pathname.lower()
-        
-        # Define sensitive patterns for each data type
-        sensitive_patterns = {
-            'contacts': ['contacts2.db', 'contacts.db', 'people.db', '/contacts/', 'addressbook'],
-            'sms': ['mmssms.db', 'sms.db', 'mms.db', '/sms/', '/messages/', 'telephony.db'],
-            'calendar': ['calendar.db', 'calendarconfig.db', '/calendar/', 'events.db'],
-            'call_logs': ['calllog.db', 'calls.db', '/calllog/', 'call_log.db']
-        }
-        
-        # Check if pathname contains sensitive patterns for this data type
-        patterns = sensitive_patterns.get(data_type, [])
-        for pattern in patterns:
-            if pattern in pathname_lower:
-                return True
-        
-        # Additional check for Android provider URIs or database files
-        if data_type == 'contacts' and ('com.android.contacts' in pathname_lower or 'contacts' in pathname_lower):
-            return True
-        elif data_type == 'sms' and ('com.android.providers.telephony' in pathname_lower or 'telephony' in pathname_lower):
-            return True
-        elif data_type == 'calendar' and ('com.android.providers.calendar' in pathname_lower or 'calendar' in pathname_lower):
-            return True
-        elif data_type in ['', 'call_logs'] and ('calllog' in pathname_lower or 'calls' in pathname_lower):
-            return True
-        
-        # If pathname is just a device node like '/dev/something', it might not be sensitive data
-        if pathname_lower.startswith('/dev/') and data_type not in pathname_lower:
-            return False
-            
-        # Default to false for unrecognized patterns to reduce false positives
-        return False
+        # Pathname must contain one of the data type's file patterns or provider keywords;
+        # anything else (e.g. a bare /dev/ node) is treated as not sensitive
+        regex = _SENSITIVE_REGEXES.get(data_type)
+        return bool(regex and regex.search(pathname))
+
+def read_json(path):
+        """
+        Load a UTF-8 JSON file, parsing with orjson when it is installed
+        Decode errors are json.JSONDecodeError subclasses with either parser
+        """
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
 
 def make_json_serializable(obj):
         """Convert sets and other non-serializable objects to JSON-serializable format"""